@@ -103,10 +103,13 @@ class NameTable {
  * \param expr The input expression.
  * \param binds The variable to expression map that will be used to help the
  *        binding.
+ * \param gvar_binds The global var map that is used to replace the global vars
+ *        referenced in the expression.
  *
  * \return The updated expression.
  */
-TVM_DLL Expr Bind(const Expr& expr, const tvm::Map<Var, Expr>& binds);
+TVM_DLL Expr Bind(const Expr& expr, const tvm::Map<Var, Expr>& binds,
+                  const tvm::Map<GlobalVar, GlobalVar>& gvar_binds = {});
 
 /*!
  * \brief Check if the given StructInfo is for a boolean scalar (tensor of rank 0 with a boolean
@@ -34,22 +34,83 @@ If this fails, there may still be dynamic operations in the model.
 Not all TVM kernels currently support dynamic shapes, please file an issue on
 github.com/apache/tvm/issues if you hit an error with dynamic kernels.
 """
+import bisect
 import math
+import operator
+import os
+import string
+import sys
 import warnings
-from typing import Union, List, Dict, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
+from itertools import accumulate
+from typing import Union, List, Dict, Tuple, Any, Callable
 import onnx.onnx_ml_pb2
 
 import numpy as _np
 
 import tvm
-from tvm import relax, topi, relay
+from tvm import relax, topi, relay, te
 from tvm.target import Target
 from tvm.ir import IRModule
 from tvm.ir.supply import NameSupply
-from tvm.relax import testing, PyExprMutator
-from tvm.relay.expr import TupleWrapper, Var, GlobalVar
+from tvm.relax import testing
+from tvm.relay.expr import TupleWrapper
 from tvm.relay.frontend.onnx import OnnxOpConverter as RelayOnnxOpConverter
 
+try:
+    from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE
+
+    # Map each onnx tensor type to the string name of its numpy datatype.
+    _ONNX_DTYPE = {key: str(value) for key, value in TENSOR_TYPE_TO_NP_TYPE.items()}
+except ImportError:
+    _ONNX_DTYPE = None
+
+try:
+    from onnx.numpy_helper import to_array as _to_array
+except ImportError:
+    _to_array = None
+
+_AttributeProto = onnx.onnx_ml_pb2.AttributeProto
+_TensorProto = onnx.onnx_ml_pb2.TensorProto
+
+# Extracts the value of an AttributeProto based on its type.
+_ATTR_PARSERS = {
+    _AttributeProto.FLOAT: lambda a: a.f,
+    _AttributeProto.INT: lambda a: a.i,
+    _AttributeProto.STRING: lambda a: a.s.decode("utf-8", errors="replace"),
+    _AttributeProto.TENSOR: lambda a: a.t,
+    _AttributeProto.GRAPH: lambda a: a.g,
+    _AttributeProto.FLOATS: lambda a: tuple(a.floats),
+    _AttributeProto.INTS: lambda a: tuple(a.ints),
+    _AttributeProto.STRINGS: lambda a: tuple(
+        s.decode("utf-8", errors="replace") for s in a.strings
+    ),
+    _AttributeProto.TENSORS: lambda a: tuple(a.tensors),
+}
+
+# Characters that a sanitized identifier may start with.
+_VALID_FIRST_CHARS = frozenset(string.ascii_letters + "_")
+
+# Tensor types whose raw_data bytes can be read directly as their numpy dtype.
+# BFLOAT16 and the FLOAT8 types map to float32 but are stored in fewer bytes.
+_RAW_DATA_TYPES = frozenset(
+    [
+        _TensorProto.BOOL,
+        _TensorProto.FLOAT16,
+        _TensorProto.FLOAT,
+        _TensorProto.DOUBLE,
+        _TensorProto.INT8,
+        _TensorProto.INT16,
+        _TensorProto.INT32,
+        _TensorProto.INT64,
+        _TensorProto.UINT8,
+        _TensorProto.UINT16,
+        _TensorProto.UINT32,
+        _TensorProto.UINT64,
+    ]
+)
+
 
 def get_type(elem_type: Union[str, int]) -> str:
     """Converts onnx integer datatype to numpy datatype"""
@@ -58,12 +119,10 @@ def get_type(elem_type: Union[str, int]) -> str:
     if isinstance(elem_type, str):
         return elem_type
 
-    try:
-        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE  # pylint: disable=import-outside-toplevel
-    except ImportError as exception:
-        raise ImportError("Unable to import onnx which is required {}".format(exception))
+    if _ONNX_DTYPE is None:
+        raise ImportError("Unable to import onnx.mapping which is required")
 
-    return str(TENSOR_TYPE_TO_NP_TYPE[elem_type])
+    return _ONNX_DTYPE[elem_type]
 
 
 def get_info(info_proto: onnx.onnx_ml_pb2.ValueInfoProto) -> Tuple[str, List, str, List]:
@@ -79,48 +138,85 @@ def get_info(info_proto: onnx.onnx_ml_pb2.ValueInfoProto) -> Tuple[str, List, st
     Tuple[str, List, str, List]
         The name, shape, type, and shape name of the ValueInfoProto.
     """
+    tensor_type = info_proto.type.tensor_type
     shape = []
     shape_name = []
-    for dim in info_proto.type.tensor_type.shape.dim:
-        name = dim.dim_param
+    for dim in tensor_type.shape.dim:
         value = dim.dim_value
-        if value is None or value == 0:
-            value = tvm.tir.Var("dyn", "int64")
-            shape_name.append(name)
+        # Protobuf integer fields default to 0 when unset, which marks a dynamic dim.
+        if not value:
+            shape.append(tvm.tir.Var("dyn", "int64"))
+            shape_name.append(dim.dim_param)
         else:
+            shape.append(value)
             shape_name.append(value)
-        shape.append(value)
 
-    name = info_proto.name
-    if info_proto.type.tensor_type.elem_type:
-        dtype = get_type(info_proto.type.tensor_type.elem_type)
-    else:
-        dtype = None
-    return name, shape, dtype, shape_name
+    elem_type = tensor_type.elem_type
+    dtype = get_type(elem_type) if elem_type else None
+    return info_proto.name, shape, dtype, shape_name
 
 
 def get_numpy(tensor_proto: onnx.onnx_ml_pb2.TensorProto) -> _np.ndarray:
     """Grab data in TensorProto and convert to numpy array."""
-    try:
-        from onnx.numpy_helper import to_array  # pylint: disable=import-outside-toplevel
-    except ImportError as exception:
-        raise ImportError("Unable to import onnx which is required {}".format(exception))
-    return to_array(tensor_proto)
+    if _to_array is None:
+        raise ImportError("Unable to import onnx.numpy_helper which is required")
+    return _to_array(tensor_proto)
+
+
+def _const_to_list(const: relax.Constant) -> List:
+    """Convert the data of a relax Constant into a (nested) python list."""
+    return const.data.numpy().tolist()
+
+
+def _scalar_const(value: Union[int, float], dtype: str) -> relax.Constant:
+    """Create a scalar relax Constant, reusing the same node for repeated values."""
+    # -0.0 and 0.0 compare and hash equal, so the sign is part of the cache key.
+    sign = math.copysign(1.0, value) if isinstance(value, float) else 1.0
+    return _cached_scalar_const(value, dtype, sign)
+
+
+@lru_cache(maxsize=256)
+def _cached_scalar_const(value: Union[int, float], dtype: str, sign: float) -> relax.Constant:
+    # pylint: disable=unused-argument
+    return relax.const(value, dtype=dtype)
+
+
+def _shape_values(expr: relax.Expr) -> Tuple:
+    """Get the static shape of a relax tensor expression as a tuple of python values."""
+    return tuple(dim.value for dim in expr.struct_info.shape.values)
+
+
+def _tensor_to_shape_expr(bb: relax.BlockBuilder, shape: relax.Expr) -> relax.ShapeExpr:
+    """Convert a 1-D shape tensor computed at runtime into a symbolic ShapeExpr."""
+    (shape_ndim,) = _shape_values(shape)
+    shape_dataflow_var = bb.emit(
+        relax.Call(
+            relax.ExternFunc("vm.builtin.tensor_to_shape"),
+            [shape],
+            sinfo_args=[relax.ShapeStructInfo(ndim=shape_ndim)],
+        )
+    )
+    # Each match_cast defines its own fresh symbolic vars, so these cannot be shared
+    # between converters.
+    shape_vars = [tvm.tir.Var("x_%d" % i, "int64") for i in range(shape_ndim)]
+    bb.match_cast(shape_dataflow_var, relax.ShapeStructInfo(shape_vars))
+    return relax.ShapeExpr(shape_vars)
 
 
 class onnx_input(list):  # pylint: disable=invalid-name
     """A list that returns None when out-of-bounds indices are accessed."""
 
     def __getitem__(self, item):
+        num_items = len(self)
         if isinstance(item, slice):
-            if item.stop is None:
-                stop = len(self)
-            else:
-                stop = item.stop
-            indices = list(range(stop)[item])
-            return [self[i] for i in indices]
+            stop = num_items if item.stop is None else item.stop
+            # Indices past the end of the list are padded with None.
+            return [
+                super(onnx_input, self).__getitem__(i) if i < num_items else None
+                for i in range(stop)[item]
+            ]
         if isinstance(item, int):
-            return list(self)[item] if item < len(self) else None
+            return super().__getitem__(item) if -num_items <= item < num_items else None
         raise TypeError("list indices must be integers or slices, not %s" % type(item).__name__)
 
 
@@ -132,6 +228,22 @@ class OnnxOpConverter(object):
     of the op and the version is selected based on the opset version of the model.
     """
 
+    @classmethod
+    def _get_versions(cls):
+        """Get the sorted versions and matching implementations defined by this converter.
+
+        The tables are built once per converter class and cached on the class itself.
+        """
+        cache = cls.__dict__.get("_versions_cache")
+        if cache is None:
+            names = set()
+            for klass in cls.__mro__:
+                names.update(name for name in vars(klass) if name.startswith("_impl_v"))
+            pairs = sorted((int(name[len("_impl_v") :]), getattr(cls, name)) for name in names)
+            cache = (tuple(v for v, _ in pairs), tuple(impl for _, impl in pairs))
+            cls._versions_cache = cache
+        return cache
+
     @classmethod
     def get_converter(cls, opset):
         """Get converter matches given opset.
@@ -146,14 +258,17 @@ class OnnxOpConverter(object):
         converter, which should be `_impl_vx`. Number x is the biggest
             number smaller than or equal to opset belongs to all support versions.
         """
-        versions = [int(d.replace("_impl_v", "")) for d in dir(cls) if "_impl_v" in d]
-        versions = sorted(versions + [opset])
-        version = versions[max([i for i, v in enumerate(versions) if v == opset]) - 1]
-        if hasattr(cls, "_impl_v{}".format(version)):
-            return getattr(cls, "_impl_v{}".format(version))
-        raise NotImplementedError(
-            "opset version {} of {} not implemented".format(version, cls.__name__)
-        )
+        versions, impls = cls._get_versions()
+        if len(impls) == 1:
+            # Most converters only define a single implementation.
+            return impls[0]
+        if not impls:
+            raise NotImplementedError(
+                "opset version {} of {} not implemented".format(opset, cls.__name__)
+            )
+        # When opset is older than every supported version this wraps around to the
+        # newest implementation, which matches the previous lookup behavior.
+        return impls[bisect.bisect_right(versions, opset) - 1]
 
 
 class MatMul(OnnxOpConverter):
@@ -207,10 +322,7 @@ class Unsqueeze(OnnxOpConverter):
         axes = inputs[1]
 
         if isinstance(axes, relax.Constant):
-            constant_axes = list(axes.data.numpy())
-            constant_axes = list(map(int, constant_axes))
-            constant_axes = sorted(constant_axes)
-            for axis in constant_axes:
+            for axis in sorted(_const_to_list(axes)):
                 data = relax.op.expand_dims(data, axis=axis)
             return data
 
@@ -277,14 +389,18 @@ class Gemm(OnnxOpConverter):
 
         # Compute Y = alpha * A X B + beta * C
 
-        if alpha is not None:
-            A = bb.normalize(relax.op.multiply(A, relax.const(alpha, dtype=dtype)))
+        if alpha is not None and alpha != 1.0:
+            A = relax.op.multiply(A, _scalar_const(alpha, dtype))
 
-        Y = bb.emit_te(topi.matmul, A, B, transA, transB)
+        if transA or transB:
+            # emit_te needs the struct info of its arguments.
+            Y = bb.emit_te(topi.matmul, bb.normalize(A), B, transA, transB)
+        else:
+            Y = relax.op.matmul(A, B)
 
         if C is not None:
-            if beta is not None:
-                C = bb.normalize(relax.op.multiply(C, relax.const(beta, dtype=dtype)))
+            if beta is not None and beta != 1.0:
+                C = relax.op.multiply(C, _scalar_const(beta, dtype))
             Y = relax.op.add(Y, C)
 
         return Y
@@ -300,24 +416,18 @@ class Reshape(OnnxOpConverter):
         # for full support.
         if not isinstance(inputs[1], relax.Constant):
             return inputs[0]
-        new_shape = inputs[1].data.numpy().tolist()
+        new_shape = _const_to_list(inputs[1])
 
         # Convert -1 dims in new_shape into positive equivalent.
         if -1 in new_shape:
             if new_shape.count(-1) != 1:
                 raise ValueError("Reshape with multiple -1 is not supported.")
 
-            data_shape = [dim.value for dim in data.struct_info.shape.values]
-            total_elements = _np.prod(data_shape)
-            new_product = 1
-            for dim in new_shape:
-                if dim > 0:
-                    new_product *= dim
+            total_elements = reduce(operator.mul, _shape_values(data), 1)
+            new_product = reduce(operator.mul, (dim for dim in new_shape if dim > 0), 1)
 
             # Replace -1 with positive equivalent
-            for i, dim in enumerate(new_shape):
-                if dim == -1:
-                    new_shape[i] = int(total_elements / new_product)
+            new_shape[new_shape.index(-1)] = total_elements // new_product
 
         return bb.emit_te(topi.reshape, data, new_shape)
 
@@ -483,7 +593,7 @@ class Squeeze(OnnxOpConverter):
     def _impl_v13(cls, bb, inputs, attr):
         axis = inputs[1]
         if axis is not None:
-            axis = [int(x) for x in inputs[1].data.numpy()]
+            axis = _const_to_list(axis)
         return relax.op.squeeze(inputs[0], axis)
 
 
@@ -498,7 +608,7 @@ class Constant(OnnxOpConverter):
         # Constants may rarely have string types. These are likely exported
         # from other frameworks and not actually used in TVM. We'll just use
         # a zero valued constant for compatibility.
-        if isinstance(value, bytes):
+        if isinstance(value, str):
             np_value = _np.asarray([0]).astype("int64")
         else:
             np_value = get_numpy(value)
@@ -513,28 +623,19 @@ class ConstantOfShape(OnnxOpConverter):
     @classmethod
     def _impl_v9(cls, bb, inputs, attr):
         shape = inputs[0]
-        shape_ndim = [dim.value for dim in shape.struct_info.shape.values][0]
-        value = get_numpy(attr.get("value", 0))
-        if isinstance(value, _np.ndarray):
-            dtype = str(value.dtype)
+        # Create a constant for the new value, a float32 zero by default.
+        if "value" in attr:
+            value = get_numpy(attr["value"])
+            const_value = _scalar_const(value.item(), str(value.dtype))
         else:
-            dtype = "float32"
-        # Create a constant for the new value.
-        const_value = relax.const(value, dtype)
+            const_value = _scalar_const(0.0, "float32")
+
+        # A constant shape can be broadcast to directly.
+        if isinstance(shape, relax.Constant):
+            return relax.op.broadcast_to(const_value, relax.ShapeExpr(_const_to_list(shape)))
 
         # Broadcast the constant to the input shape.
-        shape_dataflow_var = bb.emit(
-            relax.Call(
-                relax.ExternFunc("vm.builtin.tensor_to_shape"),
-                [shape],
-                sinfo_args=[relax.ShapeStructInfo(ndim=shape_ndim)],
-            )
-        )
-        shape_vars = []
-        for i in range(shape_ndim):
-            shape_vars.append(tvm.tir.Var("x_%d" % i, "int64"))
-        bb.match_cast(shape_dataflow_var, relax.ShapeStructInfo(shape_vars))
-        return relax.op.broadcast_to(const_value, relax.ShapeExpr(shape_vars))
+        return relax.op.broadcast_to(const_value, _tensor_to_shape_expr(bb, shape))
 
 
 class Sub(OnnxOpConverter):
@@ -582,10 +683,8 @@ class Min(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        # Expand inputs, stack them, then perform minimum over the new axis.
-        inputs = [bb.normalize(relax.op.expand_dims(i, axis=0)) for i in inputs]
-        stacked_tensor = relax.op.concat(inputs, axis=0)
-        return relax.op.min(stacked_tensor, axis=0)
+        # Reduce the inputs pairwise to avoid materializing a stacked tensor.
+        return reduce(lambda lhs, rhs: bb.emit_te(topi.minimum, lhs, rhs), inputs)
 
 
 class Max(OnnxOpConverter):
@@ -593,10 +692,8 @@ class Max(OnnxOpConverter):
 
     @classmethod
     def _impl_v13(cls, bb, inputs, attr):
-        # Expand inputs, stack them, then perform maximum over the new axis.
-        inputs = [bb.normalize(relax.op.expand_dims(i, axis=0)) for i in inputs]
-        stacked_tensor = relax.op.concat(inputs, axis=0)
-        return relax.op.max(stacked_tensor, axis=0)
+        # Reduce the inputs pairwise to avoid materializing a stacked tensor.
+        return reduce(lambda lhs, rhs: bb.emit_te(topi.maximum, lhs, rhs), inputs)
 
 
 class Log(OnnxOpConverter):
@@ -630,11 +727,7 @@ class Split(OnnxOpConverter):
     def _impl_v1(cls, bb, inputs, attr):
         splits = attr.get("split", None)
         if splits is not None and len(splits) > 1:
-            indices = []
-            index = 0
-            for i in splits[:-1]:
-                index += i
-                indices.append(index)
+            indices = list(accumulate(splits[:-1]))
         # When splits isnt specified divide evenly over axis.
         else:
             indices = attr["tvm_custom"]["num_outputs"]
@@ -648,12 +741,8 @@ class Split(OnnxOpConverter):
             splits_rank = splits.checked_type.ndim
         if splits is not None and splits_rank > 0:
             if isinstance(splits, relax.Constant):
-                splits = splits.data.asnumpy()
-                indices = []
-                index = 0
-                for i in splits[:-1]:
-                    index += i
-                    indices.append(index)
+                splits = _const_to_list(splits)
+                indices = list(accumulate(splits[:-1]))
             else:
                 raise ValueError("Dynamic Split not yet supported")
         # When splits isnt specified divide evenly over axis.
@@ -681,14 +770,14 @@ class Slice(OnnxOpConverter):
         ):
             raise ValueError("Only constant Slice parameters are currently supported.")
         # Convert parameters to constant lists.
-        starts = starts.data.numpy().tolist()
-        ends = ends.data.numpy().tolist()
+        starts = _const_to_list(starts)
+        ends = _const_to_list(ends)
         if axes is not None:
-            axes = axes.data.numpy().tolist()
+            axes = _const_to_list(axes)
         else:
             axes = list(range(len(starts)))
         if steps is not None:
-            steps = steps.data.numpy().tolist()
+            steps = _const_to_list(steps)
         else:
             steps = [1] * len(axes)
         return bb.emit_te(topi.strided_slice, data, starts, ends, strides=steps, axes=axes)
@@ -706,13 +795,13 @@ class Pad(OnnxOpConverter):
             constant_value = 0.0
 
         if isinstance(pads, relax.Constant):
-            pad_before, pad_after = _np.split(pads.data.numpy(), 2)
-            pad_before = _np.ndarray.tolist(pad_before)
-            pad_after = _np.ndarray.tolist(pad_after)
+            pads = _const_to_list(pads)
+            half = len(pads) // 2
+            pad_before, pad_after = pads[:half], pads[half:]
         else:
             raise ValueError("Dynamic pads are not supported yet.")
 
-        pad_mode = attr.get("mode", b"constant").decode("utf-8")
+        pad_mode = attr.get("mode", "constant")
         if not pad_mode in ["constant", "edge", "reflect"]:
             raise tvm.error.OpAttributeInvalid(
                 "Value " + pad_mode + ' in attribute "mode" is invalid for operator Pad.'
@@ -734,7 +823,7 @@ class Tile(OnnxOpConverter):
     def _impl_v13(cls, bb, inputs, attr):
         reps = inputs[1]
         if isinstance(reps, relax.Constant):
-            reps = reps.data.numpy().tolist()
+            reps = _const_to_list(reps)
         else:
             raise ValueError("Dynamic reps for Tile are supported yet.")
         return bb.emit_te(topi.tile, inputs[0], reps)
@@ -747,20 +836,127 @@ class Expand(OnnxOpConverter):
     def _impl_v13(cls, bb, inputs, attr):
         data = inputs[0]
         shape = inputs[1]
-        shape_ndim = [dim.value for dim in shape.struct_info.shape.values][0]
-        shape_dataflow_var = bb.emit(
-            relax.Call(
-                relax.ExternFunc("vm.builtin.tensor_to_shape"),
-                [shape],
-                sinfo_args=[relax.ShapeStructInfo(ndim=shape_ndim)],
+
+        if isinstance(shape, relax.Constant):
+            new_shape = _const_to_list(shape)
+            data_shape = list(data.struct_info.shape.values)
+            # Expand broadcasts bidirectionally, so dims of 1 in the new shape keep
+            # the corresponding data dims.
+            ndim = max(len(data_shape), len(new_shape))
+            data_shape = [1] * (ndim - len(data_shape)) + data_shape
+            new_shape = [1] * (ndim - len(new_shape)) + new_shape
+            out_shape = [
+                data_dim if new_dim == 1 else new_dim
+                for data_dim, new_dim in zip(data_shape, new_shape)
+            ]
+            return relax.op.broadcast_to(data, relax.ShapeExpr(out_shape))
+
+        return relax.op.broadcast_to(data, _tensor_to_shape_expr(bb, shape))
+
+
+def _fused_qkv_projection(input_emb, weight, bias, num_heads, head_size, query_scale):
+    """Compute the Q, K and V projections of an Attention node in a single kernel.
+
+    The matmul, bias add and the split of the hidden dimension into heads are all
+    expressed through indexing, so each output is directly laid out as
+    (batch_size * num_heads, seq_len, head_size). Q is multiplied by query_scale in
+    its bias add, which scales the attention scores without a pass over them.
+    """
+    batch_size, seq_len, in_hidden = input_emb.shape
+    out_hidden = num_heads * head_size
+    query_scale = tvm.tir.const(query_scale, input_emb.dtype)
+
+    def _column(index, bh, d):
+        # Column of the packed (in_hidden, 3 * out_hidden) weight feeding this output.
+        return index * out_hidden + (bh % num_heads) * head_size + d
+
+    def _project(index):
+        prefix = "qkv"[index]
+        k = te.reduce_axis((0, in_hidden), name="k")
+        matmul = te.compute(
+            (batch_size * num_heads, seq_len, head_size),
+            lambda bh, s, d: te.sum(
+                input_emb[bh // num_heads, s, k] * weight[k, _column(index, bh, d)], axis=k
+            ),
+            name=prefix + "_matmul",
+        )
+        if index == 0:
+            return te.compute(
+                matmul.shape,
+                lambda bh, s, d: (matmul[bh, s, d] + bias[_column(index, bh, d)]) * query_scale,
+                name=prefix + "_bias_add",
             )
+        return te.compute(
+            matmul.shape,
+            lambda bh, s, d: matmul[bh, s, d] + bias[_column(index, bh, d)],
+            name=prefix + "_bias_add",
         )
 
-        shape_vars = []
-        for i in range(shape_ndim):
-            shape_vars.append(tvm.tir.Var("x_%d" % i, "int64"))
-        bb.match_cast(shape_dataflow_var, relax.ShapeStructInfo(shape_vars))
-        return bb.normalize(relax.op.broadcast_to(data, relax.ShapeExpr(shape_vars)))
+    return [_project(index) for index in range(3)]
+
+
+def _stack_present(key, value, num_heads):
+    """Stack K and V into the (2, batch_size, num_heads, seq_len, head_size) present state.
+
+    K and V are laid out as (batch_size * num_heads, seq_len, head_size), so the head split
+    is folded into the indexing instead of materializing reshaped copies before stacking.
+    """
+    batch_size_x_heads, seq_len, head_size = key.shape
+    return te.compute(
+        (2, batch_size_x_heads // num_heads, num_heads, seq_len, head_size),
+        lambda i, b, h, s, d: tvm.tir.if_then_else(
+            i == 0, key[b * num_heads + h, s, d], value[b * num_heads + h, s, d]
+        ),
+        name="present",
+    )
+
+
+def _mask_to_bias(mask, dtype):
+    """Convert a (batch_size, seq_len) attention mask into an additive attention bias.
+
+    The bias has shape (batch_size, 1, 1, seq_len) and, as in onnxruntime, is -10000
+    wherever the mask is not positive.
+    """
+    batch_size, seq_len = mask.shape
+    zero = tvm.tir.const(0, dtype)
+    fill_value = tvm.tir.const(-10000, dtype)
+    return te.compute(
+        (batch_size, 1, 1, seq_len),
+        lambda b, h, i, j: tvm.tir.Select(mask[b, j] > 0, zero, fill_value),
+        name="att_mask_bias",
+    )
+
+
+def _fused_attention(query, key, value, bias, num_heads):
+    """Compute softmax(Q K^T + bias) V for an Attention node in a single kernel.
+
+    Q, K and V are laid out as (batch_size * num_heads, seq_len, head_size). The attention
+    scores are computed directly in the (batch_size, num_heads, seq_len, seq_len) layout of
+    the bias and read back by head when multiplying with V, so they are never reshaped.
+    The heads are merged while writing the output, which has shape
+    (batch_size, seq_len, num_heads * head_size).
+    """
+    batch_size_x_heads, seq_len, head_size = query.shape
+    batch_size = batch_size_x_heads // num_heads
+    k = te.reduce_axis((0, head_size), name="k")
+    scores = te.compute(
+        (batch_size, num_heads, seq_len, seq_len),
+        lambda b, h, i, j: te.sum(
+            query[b * num_heads + h, i, k] * key[b * num_heads + h, j, k], axis=k
+        ),
+        name="att_scores",
+    )
+    probs = topi.nn.bias_softmax(scores, bias, axis=-1)
+    n = te.reduce_axis((0, seq_len), name="n")
+    return te.compute(
+        (batch_size, seq_len, num_heads * head_size),
+        lambda b, i, hd: te.sum(
+            probs[b, hd // head_size, i, n]
+            * value[b * num_heads + hd // head_size, n, hd % head_size],
+            axis=n,
+        ),
+        name="att_context",
+    )
 
 
 class Attention(OnnxOpConverter):
@@ -779,10 +975,10 @@ class Attention(OnnxOpConverter):
         input_emb = inputs[0]
 
         # (in_hidden, 3 * out_hidden), where out_hidden = num_heads * head_size
-        weight = bb.normalize(inputs[1])
+        weight = inputs[1]
 
         # (3 * out_hidden,)
-        bias = bb.normalize(inputs[2])
+        bias = inputs[2]
 
         # 1. (    batch,              1,        max_seq, max_seq)
         # 2. (    batch, past_seq + seq,)
@@ -790,17 +986,16 @@ class Attention(OnnxOpConverter):
         # 4. (    batch,)
         # 5. (2 * batch,)
         # For now, we only support case 2.
-        mask_index = bb.normalize(inputs[3])
+        mask_index = inputs[3]
 
         # (2, batch, num_heads, past_seq, head_size)
         past = inputs[4]
 
         # (batch, num_heads, seq, seq)
         extra_add = inputs[5]
-        input_emb_shape = [val.value for val in input_emb.struct_info.shape.values]
-        (batch_size, seq_len, _) = input_emb_shape
+        (batch_size, seq_len, _) = _shape_values(input_emb)
 
-        (out_hidden_x3,) = [val.value for val in bias.struct_info.shape.values]
+        (out_hidden_x3,) = _shape_values(bias)
         assert out_hidden_x3 % 3 == 0, "bias shape should be divisible by 3"
         out_hidden = out_hidden_x3 // 3
         assert (
@@ -811,108 +1006,36 @@ class Attention(OnnxOpConverter):
         assert (
             mask_index is not None
         ), "Attention import currently only supports required mask_index"
-        mask_index_shape = [val.value for val in mask_index.struct_info.shape.values]
-        assert (
-            len(mask_index_shape) == 2
-            and mask_index_shape[0] == batch_size
-            and mask_index_shape[1] == seq_len
+        assert _shape_values(mask_index) == (
+            batch_size,
+            seq_len,
         ), "currently only support (batch_size, sequence_length) mask index"
 
         assert past is None, "past K, V state is not currently supported"
         assert extra_add is None, "extra add to QxK not currently supported"
 
-        split_1 = bb.emit_te(topi.split, weight, 3, 1)
-        # split weight and biases and do the matmuls
-        w_Q, w_K, w_V = bb.emit(split_1[0]), bb.emit(split_1[1]), bb.emit(split_1[2])
-
-        split_2 = bb.emit_te(topi.split, bias, 3, 0)
-        b_Q, b_K, b_V = bb.emit(split_2[0]), bb.emit(split_2[1]), bb.emit(split_2[2])
-        # need to merge batch dimensions since TVM matmul is 2D
-
-        # TODO(@yuchen): check reverse_reshape, a hack here
-        input_emb = bb.emit_te(
-            topi.reshape, input_emb, (input_emb_shape[0] * input_emb_shape[1], input_emb_shape[2])
+        # Q, K and V with shape (batch_size * num_heads, seq_len, head_size).
+        # Q is pre-scaled by 1 / sqrt(head_size).
+        qkv = bb.emit_te(
+            _fused_qkv_projection,
+            input_emb,
+            weight,
+            bias,
+            num_heads,
+            head_size,
+            1 / math.sqrt(head_size),
         )
+        Q, K, V = bb.emit(qkv[0]), bb.emit(qkv[1]), bb.emit(qkv[2])
 
-        mul = bb.emit_te(topi.nn.matmul, input_emb, w_Q)
-
-        Q = bb.emit_te(topi.add, mul, b_Q)
-
-        mul2 = bb.emit_te(topi.nn.matmul, input_emb, w_K)
-        K = bb.emit_te(topi.add, mul2, b_K)
-
-        mul3 = bb.emit_te(topi.nn.matmul, input_emb, w_V)
-        V = bb.emit_te(topi.add, mul3, b_V)
-
-        # massage tensors in preparation for batched matmul
-        def massage(bb, tensor):
-            tensor = bb.emit_te(topi.reshape, tensor, (batch_size, seq_len, num_heads, head_size))
-
-            # (batch_size, num_heads, seq_len, head_size)
-            tensor = bb.emit_te(topi.transpose, tensor, [0, 2, 1, 3])
-            tensor_shape = [val.value for val in tensor.struct_info.shape.values]
-
-            # (batch_size * num_heads, seq_len, head_size)
-            # TODO(@yuchen): check reverse_reshape, hack here
-            return bb.emit_te(
-                topi.reshape,
-                tensor,
-                (tensor_shape[0] * tensor_shape[1], tensor_shape[2], tensor_shape[3]),
-            )
+        present = bb.emit_te(_stack_present, K, V, num_heads)
 
-        Q = massage(bb, Q)
-        K = massage(bb, K)
-        V = massage(bb, V)
-
-        K_present = bb.emit_te(topi.reshape, K, (batch_size, num_heads, seq_len, head_size))
-        V_present = bb.emit_te(topi.reshape, V, (batch_size, num_heads, seq_len, head_size))
-        present = bb.emit_te(topi.stack, [K_present, V_present], 0)
-
-        att_scores = bb.emit_te(topi.nn.batch_matmul, Q, K, transpose_a=False, transpose_b=True)
-        score_dtype = att_scores.checked_type.dtype
-        att_scores = bb.emit_te(
-            topi.multiply,
-            att_scores,
-            relax.const(1 / _np.sqrt(head_size), dtype=att_scores.checked_type.dtype),
-        )
-        att_scores = bb.emit_te(topi.reshape, att_scores, (batch_size, num_heads, seq_len, seq_len))
+        score_dtype = Q.checked_type.dtype
 
         # build the attention mask
-        att_mask = bb.emit_te(topi.cast, mask_index, score_dtype)
-        att_mask = bb.emit_te(topi.expand_dims, att_mask, 1, num_newaxis=2)
-        att_mask = bb.emit_te(topi.subtract, relax.const(1, dtype=score_dtype), att_mask)
-        att_mask = bb.emit_te(topi.multiply, att_mask, relax.const(-10000, dtype=score_dtype))
-
-        # apply the mask
-        att_scores = bb.emit_te(topi.add, att_scores, att_mask)
-        att_scores = bb.emit_te(
-            topi.reshape, att_scores, (batch_size * num_heads, seq_len, seq_len)
-        )
-
-        att_probs = bb.emit_te(topi.nn.softmax, att_scores, axis=-1)
-
-        output = bb.emit_te(
-            topi.nn.batch_matmul, att_probs, V, transpose_a=False, transpose_b=False
-        )
-
-        # TODO(@yuchen): check reverse_reshape, hack here
-        output_shape = [val.value for val in output.struct_info.shape.values]
-        output = bb.emit_te(
-            topi.reshape,
-            output,
-            (
-                int(output_shape[0]) // num_heads,
-                num_heads,
-                int(output_shape[1]),
-                int(output_shape[2]),
-            ),
-        )
+        att_mask = bb.emit_te(_mask_to_bias, mask_index, score_dtype)
 
-        output = bb.emit_te(topi.transpose, output, axes=[0, 2, 1, 3])
-        output_shape = [val.value for val in output.struct_info.shape.values]
-        output = bb.emit_te(
-            topi.reshape, output, (int(output_shape[0]), int(output_shape[1]), out_hidden)
-        )
+        # (batch_size, seq_len, out_hidden)
+        output = bb.emit_te(_fused_attention, Q, K, V, att_mask, num_heads)
         return relax.Tuple([output, present])
 
 
@@ -930,12 +1053,12 @@ class Resize(OnnxOpConverter):
     @classmethod
     def _impl_v18(cls, bb, inputs, attr):
         # Extract the many attributes of resize.
-        coord_mode = attr.get("coordinate_transformation_mode", b"half_pixel").decode("ascii")
+        coord_mode = attr.get("coordinate_transformation_mode", "half_pixel")
         cubic_coeff_a = attr.get("cubic_coeff_a", -0.75)
         exclude_outside = attr.get("exclude_outside", 0)
         extrapolation_value = attr.get("extrapolation_value", 0.0)
-        mode = attr.get("mode", b"nearest").decode("ascii")
-        rounding_method = attr.get("nearest_mode", b"round_prefer_floor").decode("ascii")
+        mode = attr.get("mode", "nearest")
+        rounding_method = attr.get("nearest_mode", "round_prefer_floor")
 
         # Adapt attributes to fit TVM definition.
         if mode == "nearest":
@@ -954,7 +1077,18 @@ class Resize(OnnxOpConverter):
         ), "Only one of scales and sizes can be provided in Resize."
 
         # Define relax implementation.
-        if roi is not None:
+        if isinstance(roi, relax.Constant):
+            roi = roi.data.numpy()
+            # Exporters commonly pass an empty roi, which is only read in tf_crop_and_resize.
+            if roi.size == 0:
+                roi = [0.0] * 4
+            elif roi.size == 2 * ndims:
+                roi = _np.concatenate([roi[2:ndims], roi[ndims + 2 : 2 * ndims]]).tolist()
+            else:
+                raise ValueError(
+                    "Resize roi should have {} values but got {}.".format(2 * ndims, roi.size)
+                )
+        elif roi is not None:
             roi = relax.op.concat(
                 [
                     relax.op.strided_slice(roi, axes=[0], begin=[2], end=[ndims]),
@@ -969,13 +1103,13 @@ class Resize(OnnxOpConverter):
         if scales is not None:
             assert isinstance(scales, relax.Constant), "Only constant scales currently supported."
             scales = scales.data.numpy()
-            sizes_shape = [dim.value for dim in x.struct_info.shape]
+            sizes_shape = _np.array(_shape_values(x), dtype="float64")
             sizes = (sizes_shape * scales)[2:].astype("int64").tolist()
         else:
             assert isinstance(
                 sizes, relax.Constant
             ), "Only constant output size currently supported."
-            sizes = sizes.data.numpy().astype("int64").tolist()[2:]
+            sizes = sizes.data.numpy()[2:].astype("int64").tolist()
 
         # TODO(jwfromm) relax.image.resize2d runs into some issues with dynamism.
         return bb.emit_te(
@@ -998,7 +1132,7 @@ class Einsum(OnnxOpConverter):
 
     @classmethod
     def _impl_v12(cls, bb, inputs, attr):
-        equation = attr["equation"].decode("utf-8")
+        equation = attr["equation"]
         return bb.emit_te(topi.einsum, equation, *inputs)
 
 
@@ -1008,19 +1142,20 @@ class Range(OnnxOpConverter):
     @classmethod
     def _impl_v12(cls, bb, inputs, attr):
         # TODO(jwfromm) Something is wrong with topi.arange, doesnt work with any relax expressions.
-        # Unpack inputs. Need to add relax.op.resize
+        # With constant inputs the range is computed on the host instead.
         start = inputs[0]
         assert isinstance(start, relax.Constant), "Constant start required for range."
-        start = start.data.numpy().tolist()
+        start = start.data.numpy()
         limit = inputs[1]
         assert isinstance(limit, relax.Constant), "Constant limit required for range."
-        limit = limit.data.numpy().tolist()
+        limit = limit.data.numpy()
         delta = inputs[2]
         assert isinstance(delta, relax.Constant), "Constant delta required for Range."
-        step = delta.data.numpy().tolist()
-        return bb.emit_te(topi.arange, start, limit, step)
+        step = delta.data.numpy()
+        return relax.const(_np.arange(start, limit, step, dtype=start.dtype))
 
 
+@lru_cache(maxsize=None)
 def _get_convert_map():
     return {
         "MatMul": relay.frontend.onnx.MatMul,
@@ -1113,6 +1248,21 @@ class ONNXGraphImporter:
 
     current = None
 
+    __slots__ = (
+        "_nodes",
+        "_inputs",
+        "_num_input",
+        "_shape",
+        "_input_names",
+        "_dtype",
+        "opset",
+        "_target",
+        "_name_supply",
+        "_sanitize",
+        "bb",
+        "_converter_cache",
+    )
+
     def __init__(
         self,
         shape: Dict[str, List],
@@ -1131,6 +1281,7 @@ class ONNXGraphImporter:
         self._name_supply = NameSupply()
         self._sanitize: bool = sanitize
         self.bb: relax.BlockBuilder = relax.BlockBuilder()  # pylint: disable=invalid-name
+        self._converter_cache: Dict[Tuple[str, int], Callable] = {}
 
     def from_onnx(
         self, graph: onnx.onnx_ml_pb2.ModelProto, opset: int
@@ -1173,11 +1324,16 @@ class ONNXGraphImporter:
 
     def _parse_graph_initializers(self, graph: onnx.onnx_ml_pb2.GraphProto):
         """Parse network inputs to relax, aka parameters."""
-        for init_tensor in graph.initializer:
+        init_tensors = list(graph.initializer)
+        for init_tensor in init_tensors:
             if not init_tensor.name.strip():
                 raise ValueError("Tensor's name is required.")
-            array = self._parse_array(init_tensor)
-            self._nodes[init_tensor.name] = relax.const(array)
+        # Parsing the weights is dominated by memory copies, so spread it over threads.
+        # The relax constants are still created on this thread.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            arrays = executor.map(self._parse_array, init_tensors)
+            for init_tensor, array in zip(init_tensors, arrays):
+                self._nodes[init_tensor.name] = relax.const(array)
 
     def _sanitize_name(self, name: str) -> str:
         """Sanitize a name to make it a valid identifier.
@@ -1199,7 +1355,7 @@ class ONNXGraphImporter:
             return self._name_supply.fresh_name("empty_")
 
         new_name = name.replace(".", "_")
-        if not new_name[0].isalpha() and new_name[0] != "_":
+        if new_name[0] not in _VALID_FIRST_CHARS:
             new_name = str(self._name_supply.fresh_name("input_" + new_name))
         else:
             new_name = str(self._name_supply.fresh_name(new_name))
@@ -1214,6 +1370,7 @@ class ONNXGraphImporter:
 
     def _parse_graph_input(self, graph: onnx.onnx_ml_pb2.GraphProto):
         """Parse model inputs to Relax parameters."""
+        dtype_dict = self._dtype if isinstance(self._dtype, dict) else None
         for i in graph.input:
             # from onnx v0.2, GraphProto.input has type ValueInfoProto,
             #  and the name is 'i.name'
@@ -1224,15 +1381,16 @@ class ONNXGraphImporter:
                 if i_name in self._shape:
                     i_shape = self._shape[i_name]
                 else:
-                    if "?" in str(i_shape):
+                    # Dynamic dimensions are represented by symbolic vars in get_info.
+                    if any(isinstance(dim, tvm.tir.Var) for dim in i_shape):
                         warning_msg = (
                             "Input %s has unknown dimension shapes: %s. "
                             "Specifying static values may improve performance"
                             % (i_name, str(i_shape_name))
                         )
                         warnings.warn(warning_msg)
-                if isinstance(self._dtype, dict):
-                    dtype = self._dtype[i_name] if i_name in self._dtype else d_type
+                if dtype_dict is not None:
+                    dtype = dtype_dict.get(i_name, d_type)
                 else:
                     dtype = d_type
                 var_name = self._sanitize_name(i_name) if self._sanitize else i_name
@@ -1241,15 +1399,8 @@ class ONNXGraphImporter:
 
     def _check_for_unsupported_ops(self, graph: onnx.onnx_ml_pb2.GraphProto):
         convert_map = _get_convert_map()
-        unsupported_ops = set()
-        for node in graph.node:
-            op_name = node.op_type
-            if (
-                op_name not in convert_map
-                and op_name != "Constant"
-                # and op_name not in _identity_list
-            ):
-                unsupported_ops.add(op_name)
+        op_types = {node.op_type for node in graph.node}
+        unsupported_ops = op_types - convert_map.keys() - {"Constant"}
         if unsupported_ops:
             msg = "The following operators are not supported for frontend ONNX: "
             msg += ", ".join(unsupported_ops)
@@ -1257,16 +1408,12 @@ class ONNXGraphImporter:
 
     def _construct_nodes(self, graph: onnx.onnx_ml_pb2.GraphProto):
         """Nodes are stored as directed acyclic graph."""
+        nodes = self._nodes
         for node in graph.node:
             op_name = node.op_type
             attr = self._parse_attr(node.attribute)
             # Create and populate input list.
-            inputs = onnx_input()
-            for i in node.input:
-                if i != "":
-                    inputs.append(self._nodes[i])
-                else:
-                    inputs.append(None)
+            inputs = onnx_input(nodes[i] if i != "" else None for i in node.input)
             i_name = self._parse_value_proto(node)
             outputs = node.output
             attr["tvm_custom"] = {}
@@ -1274,18 +1421,20 @@ class ONNXGraphImporter:
             attr["tvm_custom"]["num_outputs"] = len(outputs)
 
             op = self._convert_operator(op_name, inputs, attr, self.opset)
-            # Create struct information for the new operator.
-            op = self.bb.normalize(op)
+            # Create struct information for the new operator. Vars and constants
+            # returned by the converters already carry it.
+            if not isinstance(op, (relax.Var, relax.Constant)):
+                op = self.bb.normalize(op)
 
             if not isinstance(op, relax.Tuple):
-                if isinstance(op.checked_type, tvm.ir.type.TupleType):
+                op_type = op.checked_type
+                if isinstance(op_type, tvm.ir.type.TupleType):
                     # This is a var bound to a tuple. We need to unpack it and create
                     # a new tuple.
-                    tuple_items = []
-                    for i in range(len(op.checked_type.fields)):
-                        tuple_items.append(self.bb.emit(relax.TupleGetItem(op, i)))
-                    op = relax.Tuple(tuple_items)
-                    outputs_num = len(tuple_items)
+                    outputs_num = len(op_type.fields)
+                    op = relax.Tuple(
+                        [self.bb.emit(relax.TupleGetItem(op, i)) for i in range(outputs_num)]
+                    )
                 else:
                     outputs_num = 1
             else:
@@ -1297,10 +1446,10 @@ class ONNXGraphImporter:
             )
 
             if outputs_num == 1:
-                self._nodes[outputs[0]] = op
+                nodes[outputs[0]] = op
             else:
-                for k, i in zip(list(outputs), range(len(outputs))):
-                    self._nodes[k] = op[i]
+                for i, k in enumerate(outputs):
+                    nodes[k] = op[i]
 
     def _parse_value_proto(self, value_proto: onnx.onnx_ml_pb2.GraphProto):
         """Parse ValueProto or raw str."""
@@ -1311,32 +1460,25 @@ class ONNXGraphImporter:
         return name
 
     def _parse_array(self, tensor_proto: onnx.onnx_ml_pb2.TensorProto) -> tvm.nd.array:
-        np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
-        return tvm.nd.array(np_array)
+        raw_data = tensor_proto.raw_data
+        data_type = tensor_proto.data_type
+        if raw_data and data_type in _RAW_DATA_TYPES and sys.byteorder == "little":
+            # View the serialized bytes directly.
+            np_array = _np.frombuffer(raw_data, dtype=get_type(data_type))
+        else:
+            np_array = get_numpy(tensor_proto)
+        return tvm.nd.array(np_array.reshape(tuple(tensor_proto.dims)))
 
     def _parse_attr(self, attr_proto: onnx.onnx_ml_pb2.AttributeProto) -> Dict[str, Any]:
         """Convert a list of AttributeProto to a dict, with names as keys."""
         attrs = {}
         for a in attr_proto:
-            for f in ["f", "i", "s", "g"]:
-                if a.HasField(f):
-                    attrs[a.name] = getattr(a, f)
-            for f in ["floats", "ints", "strings"]:
-                if list(getattr(a, f)):
-                    assert a.name not in attrs, "Only one type of attr is allowed"
-                    attrs[a.name] = tuple(getattr(a, f))
-            for f in ["t"]:
-                if a.HasField(f):
-                    attrs[a.name] = getattr(a, f)
-            for f in ["tensors"]:
-                if list(getattr(a, f)):
-                    assert a.name not in attrs, "Only one type of attr is allowed"
-                    attrs[a.name] = tuple(getattr(a, f))
-            for f in ["graphs"]:
-                if list(getattr(a, f)):
-                    raise NotImplementedError("Field {} is not supported in relax.".format(f))
-            if a.name not in attrs:
+            parser = _ATTR_PARSERS.get(a.type)
+            if parser is None:
+                if a.type == _AttributeProto.GRAPHS:
+                    raise NotImplementedError("Field graphs is not supported in relax.")
                 raise ValueError("Cannot parse attribute: \n{}\n.".format(a))
+            attrs[a.name] = parser(a)
         return attrs
 
     def _relay_input_adapter(self, inputs: List[relax.Var]) -> List[relay.Var]:
@@ -1403,47 +1545,32 @@ class ONNXGraphImporter:
         # Restore the block builder used by the frontend.
         relax.BlockBuilder._current = prev_bb
 
-        # This dict is used by the Mapper mutator to replace the globar vars
-        # in the relax_mod with global_vars registered with the in-use block builder.
+        assert (
+            len([f for f in relax_mod.functions.values() if isinstance(f, relax.Function)]) == 1
+        ), "Expected only one Relax function in the module."
+        main_func = relax_mod["main"]
+
+        # Replace the global vars in the relax_mod with the global vars registered
+        # with the in-use block builder.
         global_var_dict = {}
         for global_var, func in relax_mod.functions.items():
             if global_var.name_hint != "main":
                 global_var_dict[global_var] = self.bb.add_func(func, global_var.name_hint)
 
-        # This dict is used by the Mapper mutator to replace the relax vars
-        # with the inputs.
+        # Replace the params of the translated function with the relax inputs.
         relax_input_dict = {}
         for relax_var in relax_inputs:
             if isinstance(relax_var, relax.Var):
                 relax_input_dict[relax_var.name_hint] = relax_var
-
-        @relax.expr_functor.mutator
-        class Mapper(PyExprMutator):
-            """Mutator to replace the global vars and relax vars in the relax_mod
-            with the global vars registered with the in-use block builder and the
-            relax vars with the inputs.
-            """
-
-            def visit_span(self, span: relax.Span):
-                return span
-
-            def visit_var_(self, var_node: Var):  # pylint: disable=arguments-differ
-                if var_node.name_hint in relax_input_dict:
-                    return relax_input_dict[var_node.name_hint]
-                return var_node
-
-            def visit_global_var_(self, gv_node: GlobalVar):  # pylint: disable=arguments-differ
-                if gv_node in global_var_dict:
-                    return global_var_dict[gv_node]
-                return gv_node
-
-        assert (
-            len([f for f in relax_mod.functions.values() if isinstance(f, relax.Function)]) == 1
-        ), "Expected only one Relax function in the module."
-        updated_func = Mapper().visit_expr(relax_mod["main"])
-
-        var_bindings = updated_func.body.blocks[0].bindings
-        if isinstance(updated_func.ret_struct_info, relax.TupleStructInfo):
+        var_dict = {
+            param: relax_input_dict[param.name_hint]
+            for param in main_func.params
+            if param.name_hint in relax_input_dict
+        }
+        updated_body = relax.utils.bind(main_func.body, var_dict, global_var_dict)
+
+        var_bindings = updated_body.blocks[0].bindings
+        if isinstance(main_func.ret_struct_info, relax.TupleStructInfo):
             # Returning a tuple.
             final_binding = var_bindings[-2]
             for binding in var_bindings[:-2]:
@@ -1480,7 +1607,10 @@ class ONNXGraphImporter:
         convert_map = _get_convert_map()
         if op_name in convert_map:
             convert_class = convert_map[op_name]
-            op_function = convert_class.get_converter(opset)
+            op_function = self._converter_cache.get((op_name, opset))
+            if op_function is None:
+                op_function = convert_class.get_converter(opset)
+                self._converter_cache[(op_name, opset)] = op_function
             # If the op_function is a subclass of Relay OnnxOpConverter then it is a relay op.
             if issubclass(convert_class, RelayOnnxOpConverter):
                 relay_inputs = self._relay_input_adapter(inputs)
@@ -1488,8 +1618,16 @@ class ONNXGraphImporter:
                 relay_inputs_copy = onnx_input()
                 for relay_input in relay_inputs:
                     relay_inputs_copy.append(relay_input)
+                # The relay converters expect string attributes as bytes.
+                relay_attrs = {}
+                for k, v in attrs.items():
+                    if isinstance(v, str):
+                        v = v.encode("utf-8")
+                    elif isinstance(v, tuple) and v and isinstance(v[0], str):
+                        v = tuple(s.encode("utf-8") for s in v)
+                    relay_attrs[k] = v
                 # TODO handle params passing
-                relay_output = op_function(relay_inputs_copy, attrs, params=[])
+                relay_output = op_function(relay_inputs_copy, relay_attrs, params=[])
                 sym = self._relay_output_adapter(inputs, relay_inputs, relay_output)
             else:
                 sym = op_function(self.bb, inputs, attrs)
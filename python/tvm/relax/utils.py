@@ -17,13 +17,13 @@
 """Utility functions for Relax"""
 import functools
 import inspect
-from typing import Any, Callable, List, Optional, TypeVar
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from .. import tir
 from ..runtime import String, convert_to_object
 from ..tir import PrimExpr
 from . import _ffi_api
-from .expr import Expr, Function, PrimValue, StringImm
+from .expr import Expr, Function, GlobalVar, PrimValue, StringImm, Var
 from .expr import Tuple as rx_Tuple
 
 
@@ -268,3 +268,31 @@ def copy_with_new_vars(func: Function) -> Function:
         The copied function.
     """
     return _ffi_api.CopyWithNewVars(func)  # type: ignore
+
+
+def bind(
+    expr: Expr,
+    binds: Dict[Var, Expr],
+    global_var_binds: Optional[Dict[GlobalVar, GlobalVar]] = None,
+) -> Expr:
+    """Bind the free variables and global vars of a Relax expression in a single pass.
+    If the expression is a function, the parameters bound by `binds` are removed from
+    its parameter list.
+
+    Parameters
+    ----------
+    expr : Expr
+        The expression to bind.
+
+    binds : Dict[Var, Expr]
+        The map from variables to the expressions they are replaced with.
+
+    global_var_binds : Optional[Dict[GlobalVar, GlobalVar]]
+        The map from global vars to the global vars they are replaced with.
+
+    Returns
+    -------
+    ret : Expr
+        The expression after binding.
+    """
+    return _ffi_api.Bind(expr, binds, global_var_binds or {})  # type: ignore
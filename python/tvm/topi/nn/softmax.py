@@ -62,8 +62,39 @@ def fast_softmax(x, axis=-1):
     return softmax_common(x, axis, True)
 
 
-def softmax_common(x, axis, use_fast_exp):
-    """The common part of softmax and fast_softmax"""
+@tvm.te.tag_scope(tag="softmax_output")
+def bias_softmax(x, bias, axis=-1):
+    """Perform softmax activation on the data with a bias added to it,
+    i.e. softmax(x + bias), without materializing the biased data.
+
+    Parameters
+    ----------
+    data : tvm.te.Tensor
+        can be any dimension
+
+    bias : tvm.te.Tensor
+        bias that is broadcast to the shape of data
+
+    axis : int
+        channel axis
+
+    Returns
+    -------
+    output : tvm.te.Tensor
+        output shape is the same as input
+    """
+    assert len(bias.shape) <= len(x.shape), "bias rank should not exceed the data rank"
+    for bias_dim, x_dim in zip(reversed(bias.shape), reversed(x.shape)):
+        if isinstance(bias_dim, tvm.tir.IntImm) and isinstance(x_dim, tvm.tir.IntImm):
+            assert bias_dim.value in (
+                1,
+                x_dim.value,
+            ), "bias shape {} cannot be broadcast to data shape {}".format(bias.shape, x.shape)
+    return softmax_common(x, axis, False, bias)
+
+
+def softmax_common(x, axis, use_fast_exp, bias=None):
+    """The common part of softmax, fast_softmax and bias_softmax"""
     shape = x.shape
     if axis < 0:
         axis = len(shape) + axis
@@ -79,17 +110,28 @@ def softmax_common(x, axis, use_fast_exp):
     def get_non_reduce_indices(indices):
         return tuple([var for (i, var) in enumerate(indices) if i != axis])
 
+    def add_bias(value, indices):
+        if bias is None:
+            return value
+        # Broadcast the bias against the trailing dimensions of the data.
+        offset = len(indices) - len(bias.shape)
+        bias_indices = [
+            0 if isinstance(dim, tvm.tir.IntImm) and dim.value == 1 else indices[offset + i]
+            for i, dim in enumerate(bias.shape)
+        ]
+        return value + bias[tuple(bias_indices)]
+
     def _compute_max(*indices):
         eval_range = insert_reduce_index(indices, k1)
-        return tvm.te.max(x[eval_range], axis=k1)
+        return tvm.te.max(add_bias(x[eval_range], eval_range), axis=k1)
 
     def _compute_delta(max_elem, *indices):
         non_reduce_indices = get_non_reduce_indices(indices)
-        return x[indices] - max_elem[non_reduce_indices]
+        return add_bias(x[indices] - max_elem[non_reduce_indices], indices)
 
     def _compute_exp(max_elem, *indices):
         non_reduce_indices = get_non_reduce_indices(indices)
-        return te.exp(x[indices] - max_elem[non_reduce_indices])
+        return te.exp(add_bias(x[indices] - max_elem[non_reduce_indices], indices))
 
     def _compute_expsum(exp, *indices):
         eval_range = insert_reduce_index(indices, k2)
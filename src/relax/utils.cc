@@ -25,7 +25,9 @@ namespace relax {
 /*! \brief Helper to implement bind params.*/
 class ExprBinder : public ExprMutator {
  public:
-  explicit ExprBinder(const tvm::Map<Var, Expr>& args_map) : args_map_(args_map) {}
+  explicit ExprBinder(const tvm::Map<Var, Expr>& args_map,
+                      const tvm::Map<GlobalVar, GlobalVar>& gvar_map)
+      : args_map_(args_map), gvar_map_(gvar_map) {}
 
   Expr VisitExpr_(const VarNode* op) final {
     auto id = GetRef<Var>(op);
@@ -37,19 +39,32 @@ class ExprBinder : public ExprMutator {
     }
   }
 
+  Expr VisitExpr_(const GlobalVarNode* op) final {
+    auto gvar = GetRef<GlobalVar>(op);
+    auto it = gvar_map_.find(gvar);
+    if (it != gvar_map_.end()) {
+      return (*it).second;
+    } else {
+      return ExprMutator::VisitExpr_(op);
+    }
+  }
+
  private:
   const tvm::Map<Var, Expr>& args_map_;
+  const tvm::Map<GlobalVar, GlobalVar>& gvar_map_;
 };
 
 /*!
  * \brief Bind params on expr
  * \param expr The expr where to bind params
  * \param args_map The map from param var to the expr it binds to
+ * \param gvar_map The map from global var to the global var it is replaced with
  * \return The result expr after bind params
  */
-Expr Bind(const Expr& expr, const tvm::Map<Var, Expr>& args_map) {
+Expr Bind(const Expr& expr, const tvm::Map<Var, Expr>& args_map,
+          const tvm::Map<GlobalVar, GlobalVar>& gvar_map) {
   if (const FunctionNode* func = expr.as<FunctionNode>()) {
-    Expr new_body = ExprBinder(args_map).VisitExpr(func->body);
+    Expr new_body = ExprBinder(args_map, gvar_map).VisitExpr(func->body);
     Array<Var> new_params;
     for (size_t i = 0; i < func->params.size(); ++i) {
       if (!args_map.count(func->params[i])) {
@@ -63,10 +78,12 @@ Expr Bind(const Expr& expr, const tvm::Map<Var, Expr>& args_map) {
     // TODO(@relax-team): Should infer the shape from the body as well
     return Function(new_params, new_body, NullOpt, func->attrs);
   } else {
-    return ExprBinder(args_map).VisitExpr(expr);
+    return ExprBinder(args_map, gvar_map).VisitExpr(expr);
   }
 }
 
+TVM_REGISTER_GLOBAL("relax.Bind").set_body_typed(Bind);
+
 bool IsBoolStructInfo(const StructInfo& sinfo, bool permit_unknown_rank,
                       bool permit_unknown_dtype) {
   const TensorStructInfoNode* tt = sinfo.as<TensorStructInfoNode>();
@@ -31,7 +31,7 @@ import tvm.testing
 from tvm import relax
 
 import onnx
-from onnx import helper, TensorProto, ModelProto, ValueInfoProto, mapping
+from onnx import helper, TensorProto, ModelProto, ValueInfoProto, mapping, numpy_helper
 import onnxruntime
 
 bg = np.random.MT19937(0)
@@ -136,6 +136,7 @@ def check_correctness(
         ([".", "123"], ["_", "input_123"]),
         ([".", "_"], ["_", "__1"]),
         (["123", "input_123"], ["input_123", "input_123_1"]),
+        (["é", "a"], ["input_é", "a"]),
     ],
 )
 def test_sanitize(input_names, expected_names):
@@ -306,22 +307,23 @@ def test_gather():
     check_correctness(model, inputs=input_values)
 
 
-@pytest.mark.parametrize("alpha", [None, 0.25])
-@pytest.mark.parametrize("beta", [None, 0.35])
+@pytest.mark.parametrize("alpha", [None, 0.25, 1.0])
+@pytest.mark.parametrize("beta", [None, 0.35, 1.0])
 @pytest.mark.parametrize("useC", [False, True])
-def test_gemm(alpha, beta, useC):
+@pytest.mark.parametrize("trans", [False, True])
+def test_gemm(alpha, beta, useC, trans):
     if useC:
         gemm_node = helper.make_node(
-            "Gemm", ["a", "b", "c"], ["y"], alpha=alpha, beta=beta, transA=1, transB=1
+            "Gemm", ["a", "b", "c"], ["y"], alpha=alpha, beta=beta, transA=trans, transB=trans
         )
     else:
         gemm_node = helper.make_node(
-            "Gemm", ["a", "b"], ["y"], alpha=alpha, beta=beta, transA=1, transB=1
+            "Gemm", ["a", "b"], ["y"], alpha=alpha, beta=beta, transA=trans, transB=trans
         )
 
     inputs = [
-        helper.make_tensor_value_info("a", TensorProto.FLOAT, [4, 3]),
-        helper.make_tensor_value_info("b", TensorProto.FLOAT, [5, 4]),
+        helper.make_tensor_value_info("a", TensorProto.FLOAT, [4, 3] if trans else [3, 4]),
+        helper.make_tensor_value_info("b", TensorProto.FLOAT, [5, 4] if trans else [4, 5]),
     ]
     if useC:
         inputs.append(helper.make_tensor_value_info("c", TensorProto.FLOAT, [1, 5]))
@@ -337,6 +339,41 @@ def test_gemm(alpha, beta, useC):
     check_correctness(model)
 
 
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int64"])
+def test_raw_data_initializer(dtype):
+    add_node = helper.make_node("Add", ["a", "b"], ["c"])
+    b_np = rg.standard_normal(size=[32, 16]).astype(dtype)
+    onnx_dtype = mapping.NP_TYPE_TO_TENSOR_TYPE[np.dtype(dtype)]
+    graph = helper.make_graph(
+        [add_node],
+        "raw_data_initializer_test",
+        inputs=[helper.make_tensor_value_info("a", onnx_dtype, [32, 16])],
+        initializer=[numpy_helper.from_array(b_np, "b")],
+        outputs=[helper.make_tensor_value_info("c", onnx_dtype, [32, 16])],
+    )
+
+    model = helper.make_model(graph, producer_name="raw_data_initializer_test")
+    check_correctness(model)
+
+
+def test_raw_data_bfloat16_initializer():
+    cast_node = helper.make_node("Cast", ["b"], ["b_float"], to=TensorProto.FLOAT)
+    add_node = helper.make_node("Add", ["a", "b_float"], ["c"])
+    b_np = rg.standard_normal(size=[32, 16]).astype("float32")
+    # bfloat16 keeps the upper 16 bits of a float32.
+    b_raw = (b_np.view("uint32") >> 16).astype("uint16").tobytes()
+    graph = helper.make_graph(
+        [cast_node, add_node],
+        "raw_data_bfloat16_initializer_test",
+        inputs=[helper.make_tensor_value_info("a", TensorProto.FLOAT, [32, 16])],
+        initializer=[helper.make_tensor("b", TensorProto.BFLOAT16, [32, 16], b_raw, raw=True)],
+        outputs=[helper.make_tensor_value_info("c", TensorProto.FLOAT, [32, 16])],
+    )
+
+    model = helper.make_model(graph, producer_name="raw_data_bfloat16_initializer_test")
+    check_correctness(model)
+
+
 @pytest.mark.parametrize(
     "in_shape, shape, out_shape",
     [([7, 32, 32, 8], [224, 256], [224, 256]), ([7, 32, 32, 8], [-1, 8192], [7, 8192])],
@@ -614,10 +651,12 @@ def test_sub():
 
 def test_min():
     verify_binary("Min", [32, 16], [32, 16], [32, 16])
+    verify_binary("Min", [32, 16], [16], [32, 16])
 
 
 def test_max():
     verify_binary("Max", [32, 16], [32, 16], [32, 16])
+    verify_binary("Max", [32, 16], [16], [32, 16])
 
 
 def test_sin():
@@ -934,8 +973,6 @@ def test_all_reduce_funcs(func, dynamic):
 
 
 @pytest.mark.parametrize("dynamic", [False, True])
-# TODO(jwfromm) Current approach to dynamic expand is technically not well formed. Reenable once fixed.
-@pytest.mark.skip("Produces ill-formed IR")
 def test_expand(dynamic):
     if dynamic:
         # TODO: Support dynamic shape for Expand
@@ -977,26 +1014,47 @@ def test_expand(dynamic):
     ref_data = np.tile(data, 4)
     _test_expand("expand_with_dim_unchanged_test", data, shape, ref_data)
 
+    # Dims of 1 in the requested shape keep the data dims.
+    in_shape = (3, 4)
+    shape = (1, 4)
+    data = np.random.uniform(size=in_shape).astype(np.float32)
+    ref_data = data * np.ones(shape, dtype=np.float32)
+    _test_expand("expand_with_dim_kept_test", data, shape, ref_data)
 
-# TODO(jwfromm) Current approach to dynamic expand is technically not well formed. Reenable once fixed.
-@pytest.mark.skip("Produces ill-formed IR")
-def test_constantofshape():
-    def verify_constantofshape(input_dim, value, dtype):
-        fill_node = helper.make_node(
-            "ConstantOfShape",
-            ["input"],
-            ["output"],
-            value=helper.make_tensor(
-                "value", mapping.NP_TYPE_TO_TENSOR_TYPE[np.dtype(dtype)], (1,), (value,)
-            ),
-        )
+    # The shape has a higher rank than the data.
+    in_shape = (3, 1)
+    shape = (2, 1, 6)
+    data = np.random.uniform(size=in_shape).astype(np.float32)
+    ref_data = data * np.ones(shape, dtype=np.float32)
+    _test_expand("expand_with_higher_rank_shape_test", data, shape, ref_data)
+
+    # The shape has a lower rank than the data.
+    in_shape = (3, 4, 1)
+    shape = (4, 5)
+    data = np.random.uniform(size=in_shape).astype(np.float32)
+    ref_data = data * np.ones(shape, dtype=np.float32)
+    _test_expand("expand_with_lower_rank_shape_test", data, shape, ref_data)
 
-        inputs = [helper.make_tensor_value_info("input", TensorProto.INT64, [len(input_dim)])]
 
+def test_constantofshape():
+    def verify_constantofshape(input_dim, value=None, dtype="float32"):
+        if value is None:
+            fill_node = helper.make_node("ConstantOfShape", ["input"], ["output"])
+        else:
+            fill_node = helper.make_node(
+                "ConstantOfShape",
+                ["input"],
+                ["output"],
+                value=helper.make_tensor(
+                    "value", mapping.NP_TYPE_TO_TENSOR_TYPE[np.dtype(dtype)], (1,), (value,)
+                ),
+            )
+
+        # The shape is an initializer, so it is imported as a constant.
         graph = helper.make_graph(
             [fill_node],
             "fill_test",
-            inputs,
+            inputs=[],
             initializer=[
                 helper.make_tensor(
                     "input",
@@ -1013,12 +1071,12 @@ def test_constantofshape():
         )
 
         model = helper.make_model(graph, producer_name="fill_test")
-        input_np = np.array(input_dim).astype("int64")
-        check_correctness(model, inputs={"input": input_np})
+        check_correctness(model)
 
     verify_constantofshape((2, 3, 4, 5), 10, "float32")
     verify_constantofshape((3, 3), 0, "int32")
     verify_constantofshape((1, 2, 3), -1, "float32")
+    verify_constantofshape((4, 2))
 
 
 def test_slice():
@@ -1160,6 +1218,14 @@ def test_attention(dynamic):
 
     verify_attention(input_array, weight, bias, mask_index, num_heads)
 
+    # Mask out a different number of trailing positions in each batch row. Negative
+    # values are masked as well.
+    for b in range(1, batch_size):
+        mask_index[b, sequence_length - b :] = 0
+    mask_index[0, 0] = -1
+
+    verify_attention(input_array, weight, bias, mask_index, num_heads)
+
 
 @pytest.mark.parametrize("dynamic", [True, False])
 def test_pad(dynamic):
@@ -1340,8 +1406,14 @@ def test_tile(dynamic):
     verify_tile(x.shape, repeats, z_array.shape)
 
 
-def test_resize():
-    resize_node = helper.make_node("Resize", ["X", "", "scales"], ["Y"], mode="cubic")
+@pytest.mark.parametrize("roi", [None, [], [0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0]])
+def test_resize(roi):
+    initializer = [helper.make_tensor("scales", TensorProto.FLOAT, [4], [1.0, 1.0, 2.0, 2.0])]
+    if roi is not None:
+        initializer.append(helper.make_tensor("roi", TensorProto.FLOAT, [len(roi)], roi))
+    resize_node = helper.make_node(
+        "Resize", ["X", "" if roi is None else "roi", "scales"], ["Y"], mode="cubic"
+    )
 
     graph = helper.make_graph(
         [resize_node],
@@ -1349,9 +1421,7 @@ def test_resize():
         inputs=[
             helper.make_tensor_value_info("X", TensorProto.FLOAT, [1, 3, 32, 32]),
         ],
-        initializer=[
-            helper.make_tensor("scales", TensorProto.FLOAT, [4], [1.0, 1.0, 2.0, 2.0]),
-        ],
+        initializer=initializer,
         outputs=[
             helper.make_tensor_value_info("Y", TensorProto.FLOAT, [1, 3, 64, 64]),
         ],
@@ -103,5 +103,23 @@ def test_copy_with_new_vars_on_ir_module_nested_function():
     assert_structural_equal(Actual, Expected)
 
 
+def test_bind_vars_and_global_vars():
+    x = relax.Var("x", R.Tensor((3,), "float32"))
+    y = relax.Var("y", R.Tensor((3,), "float32"))
+    bb = relax.BlockBuilder()
+    with bb.function("f", [x]):
+        bb.emit_func_output(x)
+    gv = bb.get().get_global_var("f")
+    new_gv = bb.add_func(bb.get()["f"], "g")
+
+    after = relax.utils.bind(relax.Call(gv, [x]), {x: y}, {gv: new_gv})
+    assert after.op.same_as(new_gv)
+    assert after.args[0].same_as(y)
+
+    after = relax.utils.bind(bb.get()["f"], {x: y})
+    assert len(after.params) == 0
+    assert after.body.body.same_as(y)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
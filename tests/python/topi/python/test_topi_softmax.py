@@ -106,5 +106,40 @@ def test_softmax(target, dev, shape, dtype, ref_data, softmax_operation, axis):
     tvm.testing.assert_allclose(b.numpy(), b_np, rtol=1e-5)
 
 
+@pytest.mark.parametrize("bias_shape", [(4, 1, 1, 8), (12, 8, 8), (8,)])
+def test_bias_softmax(target, dev, dtype, bias_shape):
+    target = tvm.target.Target(target)
+    if target.kind.name == "vulkan" and dtype == "float64":
+        pytest.xfail("Vulkan GLSL.std.450 does not support 64-bit floats")
+
+    shape = (4, 12, 8, 8)
+    A = te.placeholder(shape, dtype=dtype, name="A")
+    Bias = te.placeholder(bias_shape, dtype=dtype, name="Bias")
+    B = topi.nn.bias_softmax(A, Bias, axis=-1)
+
+    with tvm.target.Target(target):
+        fschedule = tvm.topi.testing.dispatch(target, _softmax_schedule)
+        s = fschedule(B)
+
+    a_np = np.random.uniform(size=shape).astype(dtype)
+    bias_np = np.random.uniform(size=bias_shape).astype(dtype)
+    b_np = tvm.topi.testing.softmax_python(a_np + bias_np, axis=-1)
+
+    a = tvm.nd.array(a_np, dev)
+    bias = tvm.nd.array(bias_np, dev)
+    b = tvm.nd.array(np.zeros(get_const_tuple(B.shape), dtype=B.dtype), dev)
+    f = tvm.build(s, [A, Bias, B], target)
+    f(a, bias, b)
+    tvm.testing.assert_allclose(b.numpy(), b_np, rtol=1e-5)
+
+
+@pytest.mark.parametrize("bias_shape", [(1, 4, 12, 8, 8), (4, 1, 1, 4)])
+def test_bias_softmax_invalid_bias(bias_shape):
+    A = te.placeholder((4, 12, 8, 8), name="A")
+    Bias = te.placeholder(bias_shape, name="Bias")
+    with pytest.raises(AssertionError):
+        topi.nn.bias_softmax(A, Bias, axis=-1)
+
+
 if __name__ == "__main__":
     tvm.testing.main()